@@ -0,0 +1,95 @@
+"""Call session recording with optional commit batching."""
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List, Optional
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import SessionLocal
+from .db_models import CallSession
+
+logger = logging.getLogger(__name__)
+
+# When set above 0, completed calls are queued and written in one INSERT + commit
+# per window instead of one transaction per webhook. Calls still queued when the
+# process dies are lost, so only enable where that loss window is acceptable.
+CALL_BATCH_WINDOW_MS = int(os.getenv("CALL_BATCH_WINDOW_MS", "0"))
+
+_queue: Optional[asyncio.Queue] = None
+_flusher: Optional[asyncio.Task] = None
+_stopping: Optional[asyncio.Event] = None
+
+
+async def record_call(db: AsyncSession, values: Dict[str, Any]) -> None:
+    """Store a completed call, directly or via the batch queue when batching is enabled."""
+    if _queue is not None:
+        _queue.put_nowait(values)
+        return
+
+    db.add(CallSession(**values))
+    await db.commit()
+
+
+async def start_batching() -> None:
+    """Start the background flusher if batching is enabled. Called on app startup."""
+    global _queue, _flusher, _stopping
+    if CALL_BATCH_WINDOW_MS > 0 and _flusher is None:
+        _queue = asyncio.Queue()
+        _stopping = asyncio.Event()
+        _flusher = asyncio.create_task(_flush_periodically())
+
+
+async def stop_batching() -> None:
+    """Stop the flusher and write any queued calls. Called on app shutdown."""
+    global _queue, _flusher, _stopping
+    if _flusher is None:
+        return
+
+    # Signal the loop rather than cancelling it, so a flush already in progress
+    # commits its drained rows instead of being rolled back
+    _stopping.set()
+    await _flusher
+    await _flush()
+    _queue = None
+    _flusher = None
+    _stopping = None
+
+
+async def _flush_periodically() -> None:
+    while not _stopping.is_set():
+        try:
+            await asyncio.wait_for(_stopping.wait(), CALL_BATCH_WINDOW_MS / 1000)
+        except asyncio.TimeoutError:
+            pass
+        try:
+            await _flush()
+        except Exception as e:
+            logger.error("Call session batch flush failed: %s", e)
+
+
+async def _flush() -> None:
+    """Write all queued calls in a single INSERT, falling back to per-row inserts on error."""
+    rows: List[Dict[str, Any]] = []
+    while not _queue.empty():
+        rows.append(_queue.get_nowait())
+    if not rows:
+        return
+
+    async with SessionLocal() as db:
+        try:
+            await db.execute(insert(CallSession), rows)
+            await db.commit()
+            return
+        except Exception as e:
+            await db.rollback()
+            logger.warning("Batch insert of %d calls failed (%s), retrying individually", len(rows), e)
+
+        # One bad row (e.g. a duplicate call_id) shouldn't drop the rest of the batch
+        for row in rows:
+            try:
+                await db.execute(insert(CallSession), [row])
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                logger.error("Failed to record call %s: %s", row.get("call_id"), e)
@@ -1,16 +1,32 @@
 """SQLAlchemy database models."""
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime, func
+from sqlalchemy import Column, Computed, Integer, String, Float, Text, DateTime, Index, DDL, event, func
 from app.database import Base
 
 
+def _trigram_index(name: str, column: str) -> Index:
+    """GIN trigram index so LIKE '%term%' searches avoid a sequential scan (PostgreSQL only)."""
+    return Index(
+        name,
+        column,
+        postgresql_using="gin",
+        postgresql_ops={column: "gin_trgm_ops"}
+    ).ddl_if(dialect="postgresql")
+
+
 class Load(Base):
     """Loads model for the database."""
     __tablename__ = "loads"
+    __table_args__ = (
+        Index("ix_loads_status_pickup", "status", "pickup_datetime"),
+        _trigram_index("ix_loads_origin_trgm", "origin_lc"),
+        _trigram_index("ix_loads_destination_trgm", "destination_lc"),
+        _trigram_index("ix_loads_equipment_type_trgm", "equipment_type_lc"),
+    )
 
     load_id = Column(String(50), primary_key=True)
     origin = Column(String(100), nullable=False)
     destination = Column(String(100), nullable=False)
-    pickup_datetime = Column(String(50), nullable=False)
+    pickup_datetime = Column(String(50), nullable=False, index=True)
     delivery_datetime = Column(String(50), nullable=False)
     equipment_type = Column(String(50), nullable=False)
     loadboard_rate = Column(Float, nullable=False)
@@ -23,6 +39,12 @@ class Load(Base):
     status = Column(String(20), default="available")
     created_at = Column(DateTime, server_default=func.current_timestamp())
 
+    # Lowercased copies for case-insensitive search, maintained by the database
+    # so rows inserted outside the API are covered too
+    origin_lc = Column(String(100), Computed("lower(origin)"))
+    destination_lc = Column(String(100), Computed("lower(destination)"))
+    equipment_type_lc = Column(String(50), Computed("lower(equipment_type)"))
+
 
 class CallSession(Base):
     """Call session for tracking negotiations and outcomes."""
@@ -35,8 +57,16 @@ class CallSession(Base):
     initial_rate = Column(Float)
     agreed_rate = Column(Float)
     negotiation_rounds = Column(Integer)
-    classification = Column(String(50))
-    sentiment = Column(String(20))
+    classification = Column(String(50), index=True)
+    sentiment = Column(String(20), index=True)
     duration_sec = Column(Integer)
     transcript = Column(Text)
     created_at = Column(DateTime, server_default=func.current_timestamp())
+
+
+# Trigram indexes need the pg_trgm extension before the tables are created
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
@@ -1,14 +1,140 @@
 """FMCSA carrier verification client."""
+import asyncio
 import os
+import random
+import re
+import time
+from contextlib import asynccontextmanager
 from typing import Optional, List, Dict, Any
 import httpx
 import logging
+import orjson
+from cachetools import TLRUCache
 
 logger = logging.getLogger(__name__)
 
 FMCSA_WEBKEY = os.getenv("FMCSA_WEBKEY")
 FMCSA_BASE_URL = "https://mobile.fmcsa.dot.gov/qc/services/carriers"
 
+_NON_DIGIT = re.compile(r"\D+")
+
+# MC docket numbers are at most 8 digits; anything else can't match a carrier
+MC_MAX_INPUT_LENGTH = 32
+MC_MAX_DIGITS = 8
+
+# Carrier status rarely changes intra-day; active carriers are cached longer
+CARRIER_CACHE_TTL = {"active": 3600, "inactive": 300, "not_found": 300}
+
+_carrier_cache: TLRUCache = TLRUCache(
+    maxsize=4096,
+    ttu=lambda _key, value, now: now + CARRIER_CACHE_TTL[value["status"]]
+)
+
+# Retry transient FMCSA failures with capped exponential backoff and full jitter
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+RETRY_MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.2
+RETRY_MAX_DELAY = 2.0
+RETRY_BUDGET_SEC = 10.0  # Total wall-clock time allowed across all attempts
+
+REQUEST_TIMEOUT_SEC = 10.0
+CONNECT_TIMEOUT_SEC = 5.0
+
+
+class _CircuitBreaker:
+    """
+    Opens after `fail_max` consecutive failures and fails fast for `reset_timeout` seconds,
+    then goes half-open and lets a single probe call through to decide whether to close.
+    """
+
+    def __init__(self, fail_max: int, reset_timeout: float):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    def allow_request(self) -> bool:
+        """Whether a call may go through; claims the probe slot when half-open."""
+        if self._opened_at is None:
+            return True
+        if time.monotonic() - self._opened_at < self.reset_timeout or self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probe_in_flight = False
+        if self._failures >= self.fail_max:
+            # Also re-opens after a failed half-open probe, since the count isn't reset
+            self._opened_at = time.monotonic()
+
+    def release_probe(self) -> None:
+        """Free the probe slot for a call that ended without an FMCSA outcome."""
+        self._probe_in_flight = False
+
+
+_fmcsa_breaker = _CircuitBreaker(fail_max=5, reset_timeout=30)
+
+# Bulkhead: cap in-flight FMCSA requests so a slow upstream can't tie up the whole API
+FMCSA_MAX_CONCURRENCY = 20
+FMCSA_MAX_WAITING = 100
+
+_fmcsa_semaphore = asyncio.Semaphore(FMCSA_MAX_CONCURRENCY)
+_fmcsa_waiting = 0
+
+
+@asynccontextmanager
+async def _bulkhead(timeout: float):
+    """Hold one FMCSA concurrency slot, tracking how many callers are queued for one.
+
+    Raises asyncio.TimeoutError if no slot frees up within `timeout` seconds.
+    """
+    global _fmcsa_waiting
+    _fmcsa_waiting += 1
+    try:
+        if _fmcsa_semaphore.locked():
+            await asyncio.wait_for(_fmcsa_semaphore.acquire(), timeout)
+        else:
+            # Take a free slot synchronously so the shed check sees it immediately
+            await _fmcsa_semaphore.acquire()
+    finally:
+        _fmcsa_waiting -= 1
+    try:
+        yield
+    finally:
+        _fmcsa_semaphore.release()
+
+
+# Shared client so FMCSA lookups reuse pooled keep-alive connections
+_client: Optional[httpx.AsyncClient] = None
+
+
+async def init_client() -> None:
+    """Create the shared FMCSA HTTP client. Called on app startup."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=FMCSA_BASE_URL,
+            timeout=httpx.Timeout(REQUEST_TIMEOUT_SEC, connect=CONNECT_TIMEOUT_SEC),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            headers={"Accept": "application/json"}
+        )
+
+
+async def close_client() -> None:
+    """Close the shared FMCSA HTTP client. Called on app shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
 
 async def verify_carrier(carrier_mc: str) -> Dict[str, Any]:
     """
@@ -28,42 +154,140 @@ async def verify_carrier(carrier_mc: str) -> Dict[str, Any]:
             "riskNotes": ["MC number is required"]
         }
 
+    # Extract digits only from MC number; oversized input is rejected outright
+    mc_digits = _NON_DIGIT.sub("", carrier_mc) if len(carrier_mc) <= MC_MAX_INPUT_LENGTH else ""
+    if not 1 <= len(mc_digits) <= MC_MAX_DIGITS:
+        return {
+            "eligible": False,
+            "legalName": None,
+            "status": "invalid",
+            "riskNotes": ["Invalid MC number format"]
+        }
+
     if not FMCSA_WEBKEY:
         logger.warning("FMCSA_WEBKEY not configured, using fallback verification")
         return _fallback_verification(carrier_mc)
 
     try:
-        # Extract digits only from MC number
-        mc_digits = "".join(filter(str.isdigit, carrier_mc))
-        
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"{FMCSA_BASE_URL}/docket-number/{mc_digits}",
-                params={"webKey": FMCSA_WEBKEY},
-                headers={"Accept": "application/json"}
-            )
-            
-            if response.status_code == 200:
-                return _parse_fmcsa_response(response.json())
-            elif response.status_code == 404:
-                return {
-                    "eligible": False,
-                    "legalName": None,
-                    "status": "not_found",
-                    "riskNotes": ["Carrier not found in FMCSA database"]
-                }
-            else:
-                logger.error(f"FMCSA API error: {response.status_code} - {response.text}")
-                return _fallback_verification(carrier_mc)
-                
+        cached = _carrier_cache.get(mc_digits)
+        if cached is not None:
+            return cached
+
+        if _fmcsa_semaphore.locked() and _fmcsa_waiting >= FMCSA_MAX_WAITING:
+            logger.warning("FMCSA bulkhead full (%d waiting), skipping API call", _fmcsa_waiting)
+            return _fallback_verification(carrier_mc)
+
+        if not _fmcsa_breaker.allow_request():
+            logger.warning("FMCSA circuit breaker open, skipping API call")
+            return _fallback_verification(carrier_mc)
+
+        try:
+            response = await _fetch_carrier(mc_digits)
+        except asyncio.TimeoutError:
+            # Waited the whole retry budget for a bulkhead slot; treat as shed load
+            logger.warning("FMCSA bulkhead slot not available within retry budget, skipping API call")
+            return _fallback_verification(carrier_mc)
+
+        if response.status_code == 200:
+            return _cache_result(mc_digits, _parse_fmcsa_response(orjson.loads(response.content)))
+        elif response.status_code == 404:
+            return _cache_result(mc_digits, {
+                "eligible": False,
+                "legalName": None,
+                "status": "not_found",
+                "riskNotes": ["Carrier not found in FMCSA database"]
+            })
+        else:
+            logger.error("FMCSA API error: %s", response.status_code)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("FMCSA error body: %s", response.text[:500])
+            return _fallback_verification(carrier_mc)
+
     except httpx.TimeoutException:
         logger.error("FMCSA API timeout")
         return _fallback_verification(carrier_mc)
     except Exception as e:
-        logger.error(f"FMCSA API error: {str(e)}")
+        logger.error("FMCSA API error: %s", e)
         return _fallback_verification(carrier_mc)
 
 
+async def _fetch_carrier(mc_digits: str) -> httpx.Response:
+    """Fetch carrier data from FMCSA, recording the outcome on the circuit breaker."""
+    try:
+        response = await _get_with_retry(mc_digits)
+    except (asyncio.TimeoutError, asyncio.CancelledError):
+        # Shed by our own bulkhead or cancelled: not an FMCSA failure, but a
+        # half-open probe must give up its slot so another caller can probe
+        _fmcsa_breaker.release_probe()
+        raise
+    except Exception:
+        _fmcsa_breaker.record_failure()
+        raise
+
+    if response.status_code in RETRY_STATUS_CODES:
+        _fmcsa_breaker.record_failure()
+    else:
+        _fmcsa_breaker.record_success()
+    return response
+
+
+async def _get_with_retry(mc_digits: str) -> httpx.Response:
+    """GET the carrier docket, retrying timeouts, transport errors and 429/5xx responses."""
+    if _client is None:
+        await init_client()
+
+    deadline = time.monotonic() + RETRY_BUDGET_SEC
+    attempt = 0
+    while True:
+        attempt += 1
+        error: Optional[Exception] = None
+        response: Optional[httpx.Response] = None
+        # Bound each attempt by what's left of the budget, not the client's full timeout
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise httpx.TimeoutException("FMCSA retry budget exhausted")
+        try:
+            async with _bulkhead(remaining):
+                remaining = deadline - time.monotonic()
+                response = await _client.get(
+                    f"/docket-number/{mc_digits}",
+                    params={"webKey": FMCSA_WEBKEY},
+                    timeout=httpx.Timeout(
+                        min(remaining, REQUEST_TIMEOUT_SEC),
+                        connect=min(remaining, CONNECT_TIMEOUT_SEC)
+                    )
+                )
+            if response.status_code not in RETRY_STATUS_CODES:
+                return response
+        except httpx.TransportError as e:
+            error = e
+
+        delay = _retry_delay(attempt, response)
+        if attempt >= RETRY_MAX_ATTEMPTS or time.monotonic() + delay > deadline:
+            if error is not None:
+                raise error
+            return response
+
+        logger.warning("FMCSA request attempt %d failed, retrying in %.2fs", attempt, delay)
+        await asyncio.sleep(delay)
+
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response]) -> float:
+    """Full-jitter exponential backoff, honoring a numeric Retry-After header."""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+
+def _cache_result(mc_digits: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Cache definitive FMCSA answers; errors are never cached so outages aren't memoized."""
+    if result["status"] in CARRIER_CACHE_TTL:
+        _carrier_cache[mc_digits] = result
+    return result
+
+
 def _parse_fmcsa_response(data: Dict[str, Any]) -> Dict[str, Any]:
     """Parse FMCSA API response and extract relevant information."""
     try:
@@ -102,7 +326,7 @@ def _parse_fmcsa_response(data: Dict[str, Any]) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        logger.error(f"Error parsing FMCSA response: {str(e)}")
+        logger.error("Error parsing FMCSA response: %s", e)
         return {
             "eligible": False,
             "legalName": None,
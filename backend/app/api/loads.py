@@ -1,13 +1,65 @@
 """Load search and matching logic."""
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from cachetools import TTLCache
+from sqlalchemy import case, event, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from .db_models import Load
 from .models import LoadSearchResponse
 
+# Load inventory changes rarely, so repeat searches from the voice agent are
+# served from memory for a short window
+SEARCH_CACHE_TTL = 30
+
+_search_cache: TTLCache = TTLCache(maxsize=1024, ttl=SEARCH_CACHE_TTL)
+
+# Only the columns exposed by LoadSearchResponse are fetched
+SEARCH_COLUMNS = (
+    Load.load_id,
+    Load.origin,
+    Load.destination,
+    Load.pickup_datetime,
+    Load.delivery_datetime,
+    Load.equipment_type,
+    Load.loadboard_rate,
+    Load.notes,
+    Load.weight,
+    Load.commodity_type,
+    Load.num_of_pieces,
+    Load.miles,
+    Load.dimensions,
+)
+
+
+@event.listens_for(Load, "after_insert")
+@event.listens_for(Load, "after_update")
+@event.listens_for(Load, "after_delete")
+def _invalidate_search_cache(_mapper, _connection, _target):
+    """Drop cached searches when loads change through the ORM."""
+    _search_cache.clear()
+
+
+def _location_match(column, term: str, fuzzy: bool):
+    """
+    Build the filter and score for a lowercased origin/destination term
+    against the matching lowercase column.
+    Substring matches score 30. On PostgreSQL, pg_trgm word similarity also
+    accepts near matches (typos, abbreviations) at a lower score of 20; the
+    trigram GIN indexes serve both operators.
+    """
+    substring_match = column.like(f"%{term}%")
+    if not fuzzy:
+        return substring_match, case((substring_match, 30), else_=0)
+
+    similar = literal(term).op("<%")(column)
+    return (
+        or_(substring_match, similar),
+        case((substring_match, 30), (similar, 20), else_=0)
+    )
+
 
-def search_loads(
-    db: Session,
+async def search_loads(
+    db: AsyncSession,
     origin: Optional[str] = None,
     destination: Optional[str] = None,
     equipment_type: Optional[str] = None,
@@ -19,79 +71,57 @@ def search_loads(
     Search for loads based on criteria.
     Implements basic matching with scoring.
     """
-    query = db.query(Load).filter(Load.status == "available")
+    # Text filters are case-insensitive; lowercase them once for both the
+    # cache key and the query against the *_lc columns
+    origin_l = origin.lower() if origin else None
+    destination_l = destination.lower() if destination else None
+    equipment_l = equipment_type.lower() if equipment_type else None
 
-    # Apply filters
-    if origin:
-        query = query.filter(Load.origin.ilike(f"%{origin}%"))
+    cache_key = (origin_l, destination_l, equipment_l, pickup_from, pickup_to, max_results)
+    cached = _search_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    query = select(*SEARCH_COLUMNS).where(Load.status == "available")
 
-    if destination:
-        query = query.filter(Load.destination.ilike(f"%{destination}%"))
+    # Score is computed in SQL alongside the filters: base score for available
+    # loads, plus a weight per matched field (equipment type weighted highest)
+    score = literal(10.0)
+    fuzzy = db.bind.dialect.name == "postgresql"
 
-    if equipment_type:
-        query = query.filter(Load.equipment_type.ilike(f"%{equipment_type}%"))
+    # Apply filters
+    if origin_l:
+        origin_match, origin_score = _location_match(Load.origin_lc, origin_l, fuzzy)
+        query = query.where(origin_match)
+        score = score + origin_score
+
+    if destination_l:
+        destination_match, destination_score = _location_match(Load.destination_lc, destination_l, fuzzy)
+        query = query.where(destination_match)
+        score = score + destination_score
+
+    if equipment_l:
+        equipment_match = Load.equipment_type_lc.like(f"%{equipment_l}%")
+        query = query.where(equipment_match)
+        score = score + case(
+            (Load.equipment_type_lc == equipment_l, 100),
+            (equipment_match, 50),
+            else_=0
+        )
 
     # Date filtering (simplified)
     if pickup_from:
-        query = query.filter(Load.pickup_datetime >= pickup_from)
+        query = query.where(Load.pickup_datetime >= pickup_from)
 
     if pickup_to:
-        query = query.filter(Load.pickup_datetime <= pickup_to)
-
-    # Get results and calculate scores
-    loads = query.limit(max_results * 2).all()  # Get more for scoring
-
-    results = []
-    for load in loads:
-        score = calculate_match_score(load, origin, destination, equipment_type)
-        if score > 0:  # Only include matches with positive scores
-            results.append(LoadSearchResponse(
-                load_id=load.load_id,
-                origin=load.origin,
-                destination=load.destination,
-                pickup_datetime=load.pickup_datetime,
-                delivery_datetime=load.delivery_datetime,
-                equipment_type=load.equipment_type,
-                loadboard_rate=load.loadboard_rate,
-                notes=load.notes,
-                weight=load.weight,
-                commodity_type=load.commodity_type,
-                num_of_pieces=load.num_of_pieces,
-                miles=load.miles,
-                dimensions=load.dimensions,
-                score=score
-            ))
-
-    # Sort by score and limit results
-    results.sort(key=lambda x: x.score, reverse=True)
-    return results[:max_results]
-
-
-def calculate_match_score(
-    load: Load,
-    origin: Optional[str] = None,
-    destination: Optional[str] = None,
-    equipment_type: Optional[str] = None
-) -> float:
-    """
-    Calculate match score for a load.
-    Simple scoring based on exact and partial matches.
-    """
-    score = 0.0
-
-    # Equipment type match (highest weight)
-    if equipment_type and load.equipment_type.lower() == equipment_type.lower():
-        score += 100
-    elif equipment_type and equipment_type.lower() in load.equipment_type.lower():
-        score += 50
-
-    # Origin/destination matches
-    if origin and origin.lower() in load.origin.lower():
-        score += 30
-    if destination and destination.lower() in load.destination.lower():
-        score += 30
+        query = query.where(Load.pickup_datetime <= pickup_to)
 
-    # Base score for available loads
-    score += 10
+    # Let the database rank and limit so only the returned rows are fetched
+    score = score.label("score")
+    query = query.add_columns(score).order_by(score.desc()).limit(max_results)
+    rows = (await db.execute(query)).all()
 
-    return score
+    # Rows come straight from the DB and already match the schema
+    results = [LoadSearchResponse.model_construct(**row._mapping) for row in rows]
+    _search_cache[cache_key] = results
+    return results
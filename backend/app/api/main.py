@@ -1,30 +1,39 @@
 """FastAPI application for HappyRobot Carrier Sales API."""
+import asyncio
 import os
+import secrets
 from typing import Optional
 from fastapi import FastAPI, Depends, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from dotenv import load_dotenv
 
 load_dotenv()
 
 from .models import (
     CarrierVerifyRequest, CarrierVerifyResponse,
-    LoadSearchResponse, OfferEvaluateRequest, OfferEvaluateResponse,
-    CallCompleteRequest, HealthResponse, MetricsResponse
+    LoadSearchResponse, VerifyAndSearchRequest, VerifyAndSearchResponse,
+    OfferEvaluateRequest, OfferEvaluateResponse,
+    CallCompleteRequest, CallSessionResponse, HealthResponse, MetricsResponse
 )
-from ..database import get_db, init_database, engine
-from .fmcsa import verify_carrier
+from ..database import SessionLocal, get_db, init_database
+from .fmcsa import verify_carrier, init_client, close_client
 from .loads import search_loads
 from .offers import evaluate_offer
+from .calls import record_call, start_batching, stop_batching
 from .db_models import CallSession, Load
 
-API_KEY = os.getenv("API_KEY")
+# Encoded once so each request only does a constant-time byte comparison
+API_KEY_BYTES = (os.getenv("API_KEY") or "").encode()
 
 app = FastAPI(
     title="HappyRobot Carrier Sales API",
     description="API for automated carrier sales negotiations",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
@@ -37,15 +46,26 @@ app.add_middleware(
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database tables on startup."""
-    init_database()
+    """Initialize shared HTTP client, and database tables if enabled, on startup."""
+    # Schema creation is opt-in so multiple workers don't each run DDL on boot
+    if os.getenv("AUTO_INIT_DB") == "1":
+        await init_database()
+    await init_client()
+    await start_batching()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush queued call sessions and release shared HTTP client connections on shutdown."""
+    await stop_batching()
+    await close_client()
 
 
 def verify_api_key(x_api_key: Optional[str] = Header(None, alias="x-api-key")):
     """Verify API key authentication."""
-    if not API_KEY:
+    if not API_KEY_BYTES:
         return  # Skip auth in development
-    if not x_api_key or x_api_key != API_KEY:
+    if not x_api_key or not secrets.compare_digest(x_api_key.encode(), API_KEY_BYTES):
         raise HTTPException(status_code=401, detail="Invalid API key")
     return x_api_key
 
@@ -65,7 +85,11 @@ async def verify_carrier_endpoint(
     return await verify_carrier(request.carrier_mc)
 
 
-@app.get("/api/loads/search", response_model=list[LoadSearchResponse])
+@app.get(
+    "/api/loads/search",
+    response_model=list[LoadSearchResponse],
+    response_model_exclude_none=True
+)
 async def search_loads_endpoint(
     origin: Optional[str] = None,
     destination: Optional[str] = None,
@@ -73,11 +97,11 @@ async def search_loads_endpoint(
     pickup_from: Optional[str] = None,
     pickup_to: Optional[str] = None,
     max_results: int = 10,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     api_key: str = Depends(verify_api_key)
 ):
     """Search for available loads."""
-    return search_loads(
+    return await search_loads(
         db=db,
         origin=origin,
         destination=destination,
@@ -88,14 +112,43 @@ async def search_loads_endpoint(
     )
 
 
+@app.post("/api/verify-and-search", response_model=VerifyAndSearchResponse)
+async def verify_and_search_endpoint(
+    request: VerifyAndSearchRequest,
+    db: AsyncSession = Depends(get_db),
+    api_key: str = Depends(verify_api_key)
+):
+    """Verify carrier eligibility and search loads in a single round trip."""
+    # Both calls are I/O-bound, so the FMCSA request and the DB query overlap
+    # and latency is max(fmcsa, db) rather than their sum
+    carrier, loads = await asyncio.gather(
+        verify_carrier(request.carrier_mc),
+        search_loads(
+            db=db,
+            origin=request.origin,
+            destination=request.destination,
+            equipment_type=request.equipment_type,
+            pickup_from=request.pickup_from,
+            pickup_to=request.pickup_to,
+            max_results=request.max_results
+        )
+    )
+    # Serialized here so null load fields are omitted like /api/loads/search while
+    # the carrier keeps its nulls like /api/verify
+    return ORJSONResponse({
+        "carrier": CarrierVerifyResponse.model_validate(carrier).model_dump(),
+        "loads": [load.model_dump(exclude_none=True) for load in loads]
+    })
+
+
 @app.post("/api/offers/evaluate", response_model=OfferEvaluateResponse)
 async def evaluate_offer_endpoint(
     request: OfferEvaluateRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     api_key: str = Depends(verify_api_key)
 ):
     """Evaluate a carrier's offer."""
-    return evaluate_offer(
+    return await evaluate_offer(
         db=db,
         load_id=request.load_id,
         initial_rate=request.initial_rate,
@@ -107,94 +160,118 @@ async def evaluate_offer_endpoint(
 @app.post("/api/events/call-completed")
 async def complete_call(
     request: CallCompleteRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     api_key: str = Depends(verify_api_key)
 ):
     """Store completed call data for metrics."""
-    call_session = CallSession(
-        call_id=request.call_id,
-        load_id=request.load_id,
-        carrier_mc=request.carrier_mc,
-        carrier_name=request.carrier_name,
-        initial_rate=request.initial_rate,
-        agreed_rate=request.agreed_rate,
-        negotiation_rounds=request.negotiation_rounds,
-        classification=request.classification,
-        sentiment=request.sentiment,
-        duration_sec=request.duration_sec,
-        transcript=request.transcript
-    )
-
-    db.add(call_session)
-    db.commit()
+    await record_call(db, {
+        "call_id": request.call_id,
+        "load_id": request.load_id,
+        "carrier_mc": request.carrier_mc,
+        "carrier_name": request.carrier_name,
+        "initial_rate": request.initial_rate,
+        "agreed_rate": request.agreed_rate,
+        "negotiation_rounds": request.negotiation_rounds,
+        "classification": request.classification,
+        "sentiment": request.sentiment,
+        "duration_sec": request.duration_sec,
+        "transcript": request.transcript
+    })
 
     return {"status": "recorded"}
 
 
-@app.get("/api/call-sessions")
+@app.get("/api/call-sessions", response_model=list[CallSessionResponse])
 async def get_call_sessions(
     limit: int = 20,
-    db: Session = Depends(get_db),
     api_key: str = Depends(verify_api_key)
 ):
     """Get recent call sessions."""
-    sessions = db.query(CallSession).order_by(CallSession.created_at.desc()).limit(limit).all()
-    
-    return [
-        {
-            "call_id": session.call_id,
-            "carrier_mc": session.carrier_mc,
-            "carrier_name": session.carrier_name,
-            "load_id": session.load_id,
-            "initial_rate": session.initial_rate,
-            "agreed_rate": session.agreed_rate,
-            "negotiation_rounds": session.negotiation_rounds,
-            "classification": session.classification,
-            "sentiment": session.sentiment,
-            "duration_sec": session.duration_sec,
-            "transcript": session.transcript,
-            "created_at": session.created_at.isoformat() if session.created_at else None
-        }
-        for session in sessions
-    ]
+    query = select(
+        CallSession.call_id,
+        CallSession.carrier_mc,
+        CallSession.carrier_name,
+        CallSession.load_id,
+        CallSession.initial_rate,
+        CallSession.agreed_rate,
+        CallSession.negotiation_rounds,
+        CallSession.classification,
+        CallSession.sentiment,
+        CallSession.duration_sec,
+        CallSession.transcript,
+        CallSession.created_at
+    ).order_by(CallSession.created_at.desc()).limit(limit).execution_options(yield_per=50)
+
+    # Run the query before the 200 status is sent so failures still surface as a 500.
+    # The session outlives the endpoint, so it's closed once the body is streamed
+    # (or the client disconnects)
+    db = SessionLocal()
+    try:
+        sessions = await db.stream(query)
+    except Exception:
+        await db.close()
+        raise
+
+    return StreamingResponse(
+        _stream_call_sessions(db, sessions),
+        media_type="application/json",
+        background=BackgroundTask(db.close)
+    )
+
+
+async def _stream_call_sessions(db: AsyncSession, sessions):
+    """
+    Yield call sessions as a JSON array, encoding one row at a time so memory
+    stays flat regardless of transcript sizes.
+    """
+    try:
+        yield b"["
+        separator = b""
+        async for session in sessions:
+            yield separator + CallSessionResponse.model_validate(session).model_dump_json().encode()
+            separator = b","
+        yield b"]"
+    finally:
+        await db.close()
 
 
 @app.get("/api/metrics", response_model=MetricsResponse)
 async def get_metrics(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     api_key: str = Depends(verify_api_key)
 ):
     """Get call metrics and analytics."""
-    # Get total calls
-    total_calls = db.query(CallSession).count()
+    # Per-outcome counts, rounds and revenue in one aggregate over classification
+    classification = func.coalesce(CallSession.classification, "unknown")
+    outcome_rows = (await db.execute(select(
+        classification.label("classification"),
+        func.count().label("calls"),
+        func.sum(CallSession.negotiation_rounds).label("rounds_sum"),
+        func.count(CallSession.negotiation_rounds).label("rounds_count"),
+        # Use negotiated rate if available, otherwise initial rate
+        func.sum(func.coalesce(CallSession.agreed_rate, CallSession.initial_rate)).label("revenue")
+    ).group_by(classification))).all()
 
-    # Get outcomes distribution
-    outcomes = {}
-    sentiment_dist = {}
+    sentiment = func.coalesce(CallSession.sentiment, "unknown")
+    sentiment_dist = dict((await db.execute(
+        select(sentiment, func.count()).group_by(sentiment)
+    )).all())
 
-    calls = db.query(CallSession).all()
-    for call in calls:
-        outcome = call.classification or "unknown"
-        outcomes[outcome] = outcomes.get(outcome, 0) + 1
-
-        sentiment = call.sentiment or "unknown"
-        sentiment_dist[sentiment] = sentiment_dist.get(sentiment, 0) + 1
+    outcomes = {row.classification: row.calls for row in outcome_rows}
+    total_calls = sum(outcomes.values())
 
     # Calculate conversion rate
     conversion_rate = (outcomes.get("accepted", 0) / total_calls * 100) if total_calls > 0 else 0
 
     # Calculate average negotiation rounds
-    negotiation_rounds = [call.negotiation_rounds for call in calls if call.negotiation_rounds is not None]
-    avg_negotiation_rounds = sum(negotiation_rounds) / len(negotiation_rounds) if negotiation_rounds else 0
+    rounds_count = sum(row.rounds_count for row in outcome_rows)
+    rounds_sum = sum(row.rounds_sum or 0 for row in outcome_rows)
+    avg_negotiation_rounds = rounds_sum / rounds_count if rounds_count else 0
 
     # Calculate actual revenue from accepted calls
-    total_revenue = 0
-    for call in calls:
-        if call.classification == "accepted":
-            # Use negotiated rate if available, otherwise initial rate
-            rate = call.agreed_rate if call.agreed_rate is not None else call.initial_rate
-            if rate:
-                total_revenue += rate
+    total_revenue = next(
+        (row.revenue or 0 for row in outcome_rows if row.classification == "accepted"), 0
+    )
 
     return MetricsResponse(
         total_calls=total_calls,
@@ -1,6 +1,21 @@
 """Pydantic models for API requests and responses."""
-from typing import Optional, List
-from pydantic import BaseModel, validator
+from datetime import datetime
+from typing import Annotated, Any, Callable, Optional, List
+from pydantic import BaseModel, BeforeValidator, ConfigDict
+
+
+# Webhook payloads from HappyRobot send numbers as strings and "" for missing values
+def _blank_to_none(cast: Callable[[Any], Any]) -> BeforeValidator:
+    """Pre-validator mapping None/"" to None and casting anything else."""
+    return BeforeValidator(lambda v: None if v is None or v == "" else cast(v))
+
+
+CoercedFloat = Annotated[float, BeforeValidator(float)]
+CoercedInt = Annotated[int, BeforeValidator(int)]
+OptionalFloat = Annotated[Optional[float], _blank_to_none(float)]
+OptionalInt = Annotated[Optional[int], _blank_to_none(int)]
+OptionalStr = Annotated[Optional[str], BeforeValidator(lambda v: None if v == "" else v)]
+Transcript = Annotated[str, BeforeValidator(lambda v: "" if v in ("[]", "") else str(v))]
 
 
 # FMCSA Verification
@@ -33,28 +48,31 @@ class LoadSearchResponse(BaseModel):
     score: float
 
 
+# Combined verification + load search
+class VerifyAndSearchRequest(BaseModel):
+    carrier_mc: str
+    origin: Optional[str] = None
+    destination: Optional[str] = None
+    equipment_type: Optional[str] = None
+    pickup_from: Optional[str] = None
+    pickup_to: Optional[str] = None
+    max_results: int = 10
+
+
+class VerifyAndSearchResponse(BaseModel):
+    carrier: CarrierVerifyResponse
+    loads: List[LoadSearchResponse]
+
+
 # Negotiation
 class OfferEvaluateRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore")  # Ignore extra fields
+
     load_id: str
-    initial_rate: float
-    agreed_rate: Optional[float] = None
-    negotiation_rounds: Optional[int] = None
-    counter_offer: Optional[float] = None  # Extra field from HappyRobot
-    
-    class Config:
-        extra = "ignore"  # Ignore extra fields
-        
-    @validator('initial_rate', pre=True)
-    def parse_initial_rate(cls, v):
-        return float(v)
-            
-    @validator('agreed_rate', 'counter_offer', pre=True)
-    def parse_float_fields(cls, v):
-        return float(v) if v is not None and v != "" else None
-            
-    @validator('negotiation_rounds', pre=True)
-    def parse_negotiation_rounds(cls, v):
-        return int(v) if v is not None and v != "" else None
+    initial_rate: CoercedFloat
+    agreed_rate: OptionalFloat = None
+    negotiation_rounds: OptionalInt = None
+    counter_offer: OptionalFloat = None  # Extra field from HappyRobot
 
 
 class OfferEvaluateResponse(BaseModel):
@@ -66,40 +84,19 @@ class OfferEvaluateResponse(BaseModel):
 
 # Call Completion
 class CallCompleteRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore")  # Ignore extra fields
+
     call_id: str
-    load_id: Optional[str] = None
-    carrier_mc: Optional[str] = None
-    carrier_name: Optional[str] = None
-    transcript: str
-    initial_rate: Optional[float] = None
-    agreed_rate: Optional[float] = None
-    negotiation_rounds: Optional[int] = None
+    load_id: OptionalStr = None
+    carrier_mc: OptionalStr = None
+    carrier_name: OptionalStr = None
+    transcript: Transcript
+    initial_rate: OptionalFloat = None
+    agreed_rate: OptionalFloat = None
+    negotiation_rounds: OptionalInt = None
     classification: str
-    sentiment: Optional[str] = None
-    duration_sec: int
-    
-    class Config:
-        extra = "ignore"  # Ignore extra fields
-        
-    @validator('load_id', 'carrier_mc', 'carrier_name', 'sentiment', pre=True)
-    def parse_optional_strings(cls, v):
-        return None if v == "" else v
-        
-    @validator('transcript', pre=True)
-    def parse_transcript(cls, v):
-        return "" if v in ["[]", ""] else str(v)
-        
-    @validator('initial_rate', 'agreed_rate', pre=True)
-    def parse_float_fields(cls, v):
-        return float(v) if v is not None and v != "" else None
-            
-    @validator('negotiation_rounds', pre=True)  
-    def parse_negotiation_rounds(cls, v):
-        return int(v) if v is not None and v != "" else None
-        
-    @validator('duration_sec', pre=True)
-    def parse_duration_sec(cls, v):
-        return int(v)
+    sentiment: OptionalStr = None
+    duration_sec: CoercedInt
 
 
 # Health Check
@@ -109,6 +106,8 @@ class HealthResponse(BaseModel):
 
 # Call Sessions
 class CallSessionResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)  # Built directly from DB rows
+
     call_id: str
     carrier_mc: Optional[str] = None
     carrier_name: Optional[str] = None
@@ -120,7 +119,7 @@ class CallSessionResponse(BaseModel):
     sentiment: Optional[str] = None
     duration_sec: Optional[int] = None
     transcript: Optional[str] = None
-    created_at: str
+    created_at: Optional[datetime] = None
 
 
 # Metrics
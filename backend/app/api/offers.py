@@ -1,12 +1,30 @@
 """Negotiation rules and offer evaluation logic."""
 from typing import Dict, Any, Optional
-from sqlalchemy.orm import Session
+from cachetools import TTLCache
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 
 from .db_models import Load
 
+# A negotiation evaluates the same load once per round, so keep its rate briefly
+LOAD_RATE_CACHE_TTL = 60
 
-def evaluate_offer(
-    db: Session,
+_load_rate_cache: TTLCache = TTLCache(maxsize=10_000, ttl=LOAD_RATE_CACHE_TTL)
+
+# Progressive counter offers: 92%, 89%, 87% of loadboard rate
+COUNTER_MULTIPLIERS = (0.92, 0.89, 0.87)
+
+
+@event.listens_for(Load, "after_update")
+@event.listens_for(Load, "after_delete")
+def _invalidate_load_rate(_mapper, _connection, target):
+    """Drop a cached rate when its load changes through the ORM."""
+    _load_rate_cache.pop(target.load_id, None)
+
+
+async def evaluate_offer(
+    db: AsyncSession,
     load_id: str,
     initial_rate: float,
     agreed_rate: Optional[float] = None,
@@ -18,17 +36,25 @@ def evaluate_offer(
     Floor calculation: max(loadboard_rate * 0.9, loadboard_rate - 150)
     """
     # Get load information
-    load = db.query(Load).filter(Load.load_id == load_id).first()
-    if not load:
-        return {
-            "decision": "reject",
-            "rate": None,
-            "floor": 0.0,
-            "reason": "Load not found"
-        }
+    loadboard_rate = _load_rate_cache.get(load_id)
+    if loadboard_rate is None:
+        # Primary-key lookup checks the session identity map before querying;
+        # raiseload turns any accidental lazy load (N+1) into an error
+        load = await db.get(Load, load_id, options=[raiseload("*")])
+        if not load:
+            return {
+                "decision": "reject",
+                "rate": None,
+                "floor": 0.0,
+                "reason": "Load not found"
+            }
+
+        loadboard_rate = load.loadboard_rate
+        _load_rate_cache[load_id] = loadboard_rate
 
-    loadboard_rate = load.loadboard_rate
-    floor_price = max(loadboard_rate * 0.9, loadboard_rate - 150)
+    floor_price = loadboard_rate * 0.9
+    if floor_price < loadboard_rate - 150:
+        floor_price = loadboard_rate - 150
 
     # If agreed_rate is provided, evaluate final offer
     if agreed_rate is not None:
@@ -52,9 +78,7 @@ def evaluate_offer(
     round_number = negotiation_rounds if negotiation_rounds is not None else 1
     
     if round_number <= 3:
-        # Progressive counter offers: 92%, 89%, 87% of loadboard rate
-        counter_multipliers = [0.92, 0.89, 0.87]
-        multiplier = counter_multipliers[min(round_number - 1, 2)]
+        multiplier = COUNTER_MULTIPLIERS[min(round_number - 1, 2)]
         counter_offer = loadboard_rate * multiplier
         counter_offer = max(counter_offer, floor_price)
         